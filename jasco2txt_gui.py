@@ -6,66 +6,342 @@ A simple TKinter application for converting Jasco spectroscopy files to text for
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import io
+import locale
 import os
+import re
+import sys
 import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-import struct
+import numpy as np
 
+# Size of the header preceding the data in plain (non-OLE) binary files
+RAW_HEADER_SIZE = 512
+# Largest magnitude accepted in plain binary data; random bytes decoded as
+# float32 almost always exceed it somewhere
+RAW_MAX_VALUE = 1e9
+
+# Rows formatted per call when writing the XYDATA block
+WRITE_BLOCK_ROWS = 65536
+
+# Bytes counted as text by the text-file sniff: printable ASCII, tab, LF, CR.
+# Chunks shorter than SMALL_SNIFF_SIZE are classified without numpy.
+_TEXT_BYTES = bytes([9, 10, 13]) + bytes(range(32, 127))
+SMALL_SNIFF_SIZE = 32
+
+# "DELTAX<tab>value" line in an OLE Header stream
+_DELTAX_RE = re.compile(rb'^[ \t]*DELTAX[ \t]*\t[ \t]*([-+0-9.eE]+)', re.IGNORECASE | re.MULTILINE)
+
+# Exact powers of ten for the compiled float scanner; 1e22 is the largest one
+# that a float64 holds exactly
+_POW10 = np.array([float(f"1e{k}") for k in range(23)])
+
+# Text files above this size are parsed with the compiled kernel when numba is
+# available. Importing numba and loading the kernel takes about half a second
+# per process; np.loadtxt only becomes slower than that at around 10 MB.
+NUMBA_MIN_TEXT_SIZE = 10 * 1024 * 1024
+
+
+def _scan_float(buf, i, n):
+    """Parse a decimal float starting at buf[i]. Returns (value, next index, ok)."""
+    negative = False
+    if i < n and (buf[i] == 43 or buf[i] == 45):  # '+' / '-'
+        negative = buf[i] == 45
+        i += 1
+    mantissa = 0
+    digits = 0
+    exponent = 0
+    seen_digit = False
+    while i < n and 48 <= buf[i] <= 57:
+        seen_digit = True
+        mantissa = mantissa * 10 + (int(buf[i]) - 48)
+        if mantissa:
+            digits += 1
+            if digits > 15:
+                return 0.0, i, False
+        i += 1
+    if i < n and buf[i] == 46:  # '.'
+        i += 1
+        while i < n and 48 <= buf[i] <= 57:
+            seen_digit = True
+            mantissa = mantissa * 10 + (int(buf[i]) - 48)
+            if mantissa:
+                digits += 1
+                if digits > 15:
+                    return 0.0, i, False
+            exponent -= 1
+            i += 1
+    if not seen_digit:
+        return 0.0, i, False
+    if i < n and (buf[i] == 101 or buf[i] == 69):  # 'e' / 'E'
+        i += 1
+        exp_negative = False
+        if i < n and (buf[i] == 43 or buf[i] == 45):
+            exp_negative = buf[i] == 45
+            i += 1
+        if i >= n or not (48 <= buf[i] <= 57):
+            return 0.0, i, False
+        exp_value = 0
+        while i < n and 48 <= buf[i] <= 57:
+            if exp_value < 10000:
+                exp_value = exp_value * 10 + (int(buf[i]) - 48)
+            i += 1
+        exponent += -exp_value if exp_negative else exp_value
+    # Zero stays a (signed) zero whatever the exponent
+    if mantissa == 0:
+        return (-0.0 if negative else 0.0), i, True
+    # With at most 15 significant digits the mantissa is exact, and so is any
+    # power of ten up to 1e22, so one multiply or divide is correctly rounded.
+    # Anything else is left to the caller's fallback parser.
+    if exponent > 22 or exponent < -22:
+        return 0.0, i, False
+    if exponent >= 0:
+        value = mantissa * _POW10[exponent]
+    else:
+        value = mantissa / _POW10[-exponent]
+    return (-value if negative else value), i, True
+
+
+def _split_fields(line):
+    """Split a text line into at most three fields, dropping a trailing '#' or
+    '%' comment. Fields are split on tabs if the line has any, else on commas,
+    else on whitespace. Blank and comment lines give an empty list."""
+    line = line.partition('#')[0].partition('%')[0].strip()
+    if not line:
+        return []
+    if '\t' in line:
+        return line.split('\t', 2)
+    if ',' in line:
+        return line.split(',', 2)
+    return line.split(None, 2)
+
+
+def _parse_numeric_text(buf):
+    """Parse two numeric columns from a uint8 buffer of text.
+
+    The delimiter is taken from the first data line like _split_fields does:
+    tab, else comma, else whitespace. Lines starting with '#' or '%' are
+    skipped and a trailing comment after the values is ignored. Returns
+    (points, ok); ok is False as soon as a line is not read exactly as
+    np.loadtxt would read it, so the caller can fall back to the numpy parsers.
+    """
+    n = buf.size
+    # First pass: count candidate data lines to size the output, and pick the
+    # delimiter (9 tab, 44 comma, 32 whitespace) from the first of them
+    rows = 0
+    delimiter = 0
+    i = 0
+    while i < n:
+        while i < n and (buf[i] == 32 or buf[i] == 9):
+            i += 1
+        if i < n and buf[i] != 10 and buf[i] != 13 and buf[i] != 35 and buf[i] != 37:
+            rows += 1
+            if delimiter == 0:
+                # Only the part before any comment and trailing whitespace counts
+                start = i
+                last = i
+                while i < n and buf[i] != 10 and buf[i] != 13 and buf[i] != 35 and buf[i] != 37:
+                    if buf[i] != 32 and buf[i] != 9:
+                        last = i
+                    i += 1
+                delimiter = 32
+                for j in range(start, last + 1):
+                    if buf[j] == 9:
+                        delimiter = 9
+                        break
+                    if buf[j] == 44:
+                        delimiter = 44
+        while i < n and buf[i] != 10 and buf[i] != 13:
+            i += 1
+        i += 1
+    points = np.empty((rows, 2), dtype=np.float64)
+    # Second pass: fill the array. Values may be padded with spaces; tabs are
+    # only accepted as the delimiter or around the whole row, where both numpy
+    # parsers agree on them.
+    row = 0
+    i = 0
+    while i < n:
+        start = i
+        while i < n and (buf[i] == 32 or buf[i] == 9):
+            i += 1
+        if i >= n:
+            break
+        c = buf[i]
+        if c == 10 or c == 13 or c == 35 or c == 37:
+            while i < n and buf[i] != 10 and buf[i] != 13:
+                i += 1
+            i += 1
+            continue
+        if delimiter == 9:
+            # A leading tab is an empty first field in a tab-delimited file
+            for j in range(start, i):
+                if buf[j] == 9:
+                    return points[:0], False
+        x, i, ok = _scan_float(buf, i, n)
+        if not ok:
+            return points[:0], False
+        padded = i
+        while i < n and buf[i] == 32:
+            i += 1
+        if delimiter == 32:
+            if i == padded:
+                return points[:0], False
+        else:
+            if i >= n or buf[i] != delimiter:
+                return points[:0], False
+            i += 1
+            while i < n and buf[i] == 32:
+                i += 1
+        y, i, ok = _scan_float(buf, i, n)
+        if not ok:
+            return points[:0], False
+        padded = i
+        while i < n and buf[i] == 32:
+            i += 1
+        # The row must end here (trailing whitespace allowed), start a
+        # comment, or go on to further columns
+        j = i
+        while j < n and (buf[j] == 32 or buf[j] == 9):
+            j += 1
+        if j < n and not (buf[j] == 10 or buf[j] == 13 or buf[j] == 35 or buf[j] == 37):
+            if delimiter == 32:
+                if i == padded or j != i:
+                    return points[:0], False
+            elif buf[i] != delimiter:
+                return points[:0], False
+        points[row, 0] = x
+        points[row, 1] = y
+        row += 1
+        # Skip any further columns; outside tab-delimited files a tab in them
+        # would make the tolerant parser split the row differently
+        seen_tab = False
+        while i < n and buf[i] != 10 and buf[i] != 13:
+            c = buf[i]
+            if c == 35 or c == 37:
+                while i < n and buf[i] != 10 and buf[i] != 13:
+                    i += 1
+                break
+            if c == 9 and delimiter != 9:
+                seen_tab = True
+            elif c != 32 and seen_tab:
+                return points[:0], False
+            i += 1
+        i += 1
+    return points[:row], True
+
+
+# Compiled _parse_numeric_text, or False once numba turned out to be unusable
+_compiled_parser = None
+
+
+def _compiled_text_parser():
+    """Return _parse_numeric_text compiled with numba, or None without numba.
+
+    numba is optional and only imported here, on the first large text file,
+    so conversions that never need it do not pay for loading it.
+    """
+    global _compiled_parser, _scan_float
+    if _compiled_parser is None:
+        _compiled_parser = False
+        try:
+            from numba import njit
+        except ImportError:
+            return None
+        try:
+            # Frozen builds have no source files for numba to cache against
+            jit = njit(cache=not getattr(sys, 'frozen', False), boundscheck=False)
+            # The parser calls _scan_float through the module globals, so the
+            # compiled version has to replace it there
+            _scan_float = jit(_scan_float)
+            _compiled_parser = jit(_parse_numeric_text)
+        except Exception as e:
+            print(f"[DEBUG] numba unavailable, using numpy parsers: {e}")
+    return _compiled_parser or None
 
 
 class JascoConverter:
     """Class to handle Jasco file conversion logic."""
     
+    # Extensions always parsed as text, and binary Jasco formats that skip the text sniff
+    TEXT_EXTENSIONS = {'txt', 'csv', 'dat', 'asc'}
+    BINARY_EXTENSIONS = {'jws', 'jwb', 'jwx', 'jfl'}
+    
+    # Header fields written to the TXT output, in jws2txt order
+    HEADER_FIELDS = [
+        "TITLE", "DATA TYPE", "ORIGIN", "OWNER", "DATE", "TIME", "SPECTROMETER/DATA SYSTEM", "LOCALE", "RESOLUTION", "DELTAX", "XUNITS", "YUNITS", "FIRSTX", "LASTX", "NPOINTS", "FIRSTY", "MAXY", "MINY"
+    ]
+    # Header field names keyed by their space-free spelling, for metadata lookup
+    _FIELD_LOOKUP = {f.replace(' ', ''): f for f in HEADER_FIELDS}
+    # Fields convert_to_txt always recomputes from the data points
+    COMPUTED_FIELDS = {"FIRSTX", "LASTX", "NPOINTS", "FIRSTY", "MAXY", "MINY"}
+    
     @staticmethod
     def read_jws_file(filepath):
-        import math
+        """Read a Jasco file. Returns (points, metadata): an (N, 2) array and the
+        header fields found in the file's OLE metadata streams, if any."""
+        # Read the file once; the same buffer is used for sniffing and parsing
+        raw = JascoConverter._read_file(filepath)
         file_ext = filepath.lower().split('.')[-1]
-        if file_ext in ['txt', 'csv', 'dat', 'asc'] or JascoConverter._is_text_file(filepath):
-            return JascoConverter._parse_as_text(filepath)
+        if file_ext in JascoConverter.TEXT_EXTENSIONS or (
+                file_ext not in JascoConverter.BINARY_EXTENSIONS and JascoConverter._is_text_file(raw[:1024])):
+            return JascoConverter._parse_as_text(filepath, raw), {}
         try:
             import olefile
         except ImportError:
             raise RuntimeError("olefile module is required to parse JWS files. Please install it via pip or conda.")
+        metadata = {}
         try:
-            if not olefile.isOleFile(filepath):
-                return JascoConverter._parse_as_text(filepath)
-            with olefile.OleFileIO(filepath) as ole:
+            stream = io.BytesIO(raw)
+            if not olefile.isOleFile(stream):
+                # Binary extensions skipped the sniff above; make sure a text
+                # export saved under one is not decoded as floats
+                if file_ext in JascoConverter.BINARY_EXTENSIONS and JascoConverter._is_text_file(raw[:1024]):
+                    return JascoConverter._parse_as_text(filepath, raw), metadata
+                # Plain binary file: float32 (x, y) pairs after a fixed-size header,
+                # which is never used and is skipped without copying. Only trusted
+                # for Jasco extensions and data that looks like a spectrum.
+                if file_ext in JascoConverter.BINARY_EXTENSIONS:
+                    points = JascoConverter._decode_xy_pairs(raw, offset=RAW_HEADER_SIZE)
+                    if points is not None and JascoConverter._is_plausible_spectrum(points):
+                        return points, metadata
+                return JascoConverter._parse_as_text(filepath, raw), metadata
+            with olefile.OleFileIO(stream) as ole:
                 print("[DEBUG] OLE streams:", ole.listdir())
+                # Collect header metadata while the OLE directory is open
+                metadata = JascoConverter._read_ole_metadata(ole)
                 # Case 1: X-Data and Y-Data
                 if ole.exists('X-Data') and ole.exists('Y-Data'):
                     xdata = ole.openstream('X-Data').read()
                     ydata = ole.openstream('Y-Data').read()
-                    xvals = [struct.unpack('<f', xdata[i*4:i*4+4])[0] for i in range(len(xdata)//4)]
-                    yvals = [struct.unpack('<f', ydata[i*4:i*4+4])[0] for i in range(len(ydata)//4)]
+                    xvals = JascoConverter._unpack_floats(xdata)
+                    yvals = JascoConverter._unpack_floats(ydata)
                     print(f"[DEBUG] X-Data count: {len(xvals)}, Y-Data count: {len(yvals)}")
-                    points = list(zip(xvals, yvals))
-                    if not points:
+                    n = min(len(xvals), len(yvals))
+                    points = np.column_stack((xvals[:n], yvals[:n]))
+                    if len(points) == 0:
                         raise ValueError("No valid data points found in file")
-                    return points
+                    return points, metadata
                 # Case 2: Only Y-Data (implied X)
                 if ole.exists('Y-Data'):
                     ydata = ole.openstream('Y-Data').read()
-                    yvals = [struct.unpack('<f', ydata[i*4:i*4+4])[0] for i in range(len(ydata)//4)]
+                    yvals = JascoConverter._unpack_floats(ydata)
                     # Try to get DELTAX from header
                     deltax = 1.0
                     try:
                         if ole.exists('Header'):
-                            header_raw = ole.openstream('Header').read()
-                            header_text = header_raw.decode(errors='ignore')
-                            for line in header_text.splitlines():
-                                if line.strip().upper().startswith('DELTAX'):
-                                    parts = line.split('\t')
-                                    if len(parts) == 2:
-                                        deltax = float(parts[1].strip())
-                                        break
+                            match = _DELTAX_RE.search(ole.openstream('Header').read())
+                            if match:
+                                deltax = float(match.group(1))
                     except Exception as e:
                         print(f"[DEBUG] Could not extract DELTAX: {e}")
-                    xvals = [i * deltax for i in range(len(yvals))]
+                    xvals = np.arange(len(yvals), dtype=np.float64) * deltax
                     print(f"[DEBUG] Implied X count: {len(xvals)}, Y-Data count: {len(yvals)}, DELTAX: {deltax}")
-                    points = list(zip(xvals, yvals))
-                    if not points:
+                    points = np.column_stack((xvals, yvals))
+                    if len(points) == 0:
                         raise ValueError("No valid data points found in file")
-                    return points
+                    return points, metadata
                 # Fallback to previous logic
                 stream_name = None
                 for candidate in ['Data', 'DATA', 'SpectralData', 'Spectra', 'SpecData', 'Measurement', 'Result', 'ResultData']:
@@ -80,132 +356,241 @@ class JascoConverter:
                     raise ValueError("No data stream found in JWS file.")
                 data = ole.openstream(stream_name).read()
                 print(f"[DEBUG] First 64 bytes of stream '{stream_name}':", data[:64].hex())
-                if len(data) % 8 != 0:
-                    raise ValueError("Data stream size is not a multiple of 8 bytes.")
-                num_points = len(data) // 8
-                points = []
-                nan_count = 0
-                zero_count = 0
-                for i in range(num_points):
-                    x = struct.unpack('<f', data[i*8:i*8+4])[0]
-                    y = struct.unpack('<f', data[i*8+4:i*8+8])[0]
-                    if math.isnan(x) or math.isnan(y):
-                        nan_count += 1
-                    if x == 0.0 and y == 0.0:
-                        zero_count += 1
-                    points.append((x, y))
-                if nan_count > num_points * 0.2 or zero_count > num_points * 0.5:
-                    return JascoConverter._parse_as_text(filepath)
-                return points
+                points = JascoConverter._decode_xy_pairs(data)
+                if points is None:
+                    return JascoConverter._parse_as_text(filepath, raw), metadata
+                return points, metadata
         except Exception as e:
             print(f"[DEBUG] Exception in read_jws_file: {e}")
-            return JascoConverter._parse_as_text(filepath)
+            return JascoConverter._parse_as_text(filepath, raw), metadata
     
     @staticmethod
-    def _is_text_file(filepath):
-        """Check if file appears to be a text file."""
+    def _read_ole_metadata(ole):
+        """Extract header fields from the metadata streams of an open OLE file."""
+        metadata = {}
+        # Fields still worth looking for. A repeated key overrides the earlier
+        # value, but once every field is filled the scan stops, so repeats
+        # after that point are not seen.
+        remaining = set(JascoConverter.HEADER_FIELDS) - JascoConverter.COMPUTED_FIELDS
         try:
-            with open(filepath, 'rb') as f:
-                # Read first 1024 bytes
-                chunk = f.read(1024)
-                # If most bytes are printable ASCII, consider it text
-                text_chars = sum(1 for byte in chunk if 32 <= byte <= 126 or byte in [9, 10, 13])
-                return text_chars / len(chunk) > 0.7 if chunk else False
-        except:
+            # Try to extract metadata from likely streams
+            for meta_stream in ["Header", "BaseInfo", "DataInfo", "MeasInfo", "SampleInfo", "UserInfo"]:
+                if ole.exists(meta_stream):
+                    raw = ole.openstream(meta_stream).read()
+                    try:
+                        text = raw.decode("utf-8")
+                    except:
+                        try:
+                            text = raw.decode("utf-16").replace("\x00", "")
+                        except:
+                            text = raw.decode(errors="ignore")
+                    for line in text.splitlines():
+                        # Try tab-separated, colon, or space
+                        if '\t' in line:
+                            parts = line.split('\t', 1)
+                        elif ':' in line:
+                            parts = line.split(':', 1)
+                        else:
+                            parts = line.split(None, 1)
+                        if len(parts) == 2:
+                            field = JascoConverter._FIELD_LOOKUP.get(parts[0].strip().upper().replace(' ', ''))
+                            if field:
+                                metadata[field] = parts[1].strip()
+                                if metadata[field]:
+                                    remaining.discard(field)
+                                    if not remaining:
+                                        break
+                    if not remaining:
+                        break
+                    # If all fields are filled, break
+                    if all(metadata.get(k) for k in ["TITLE", "DATE", "TIME"]):
+                        break
+        except Exception as e:
+            print(f"[DEBUG] Metadata extraction failed: {e}")
+        return metadata
+    
+    @staticmethod
+    def _read_file(filepath):
+        """Read a whole file, hinting sequential access to the OS where supported."""
+        with open(filepath, 'rb') as f:
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            return f.read()
+    
+    @staticmethod
+    def prefetch_files(filepaths):
+        """Ask the OS to start reading files into the page cache ahead of conversion."""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        for filepath in filepaths:
+            try:
+                fd = os.open(filepath, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+    
+    @staticmethod
+    def _unpack_floats(data):
+        """Decode a stream of little-endian float32 values, ignoring a trailing partial value."""
+        return np.frombuffer(data, dtype='<f4', count=len(data) // 4)
+    
+    @staticmethod
+    def _decode_xy_pairs(data, offset=0):
+        """Decode interleaved float32 (x, y) pairs starting at offset; return None if the data does not look valid."""
+        # A stray trailing partial pair is dropped rather than rejecting the stream
+        num_points = max(len(data) - offset, 0) // 8
+        if num_points == 0:
+            return None
+        # Interleaved little-endian float32 (x, y) pairs, decoded in one pass
+        points = np.frombuffer(data, dtype='<f4', count=num_points * 2, offset=offset).reshape(-1, 2)
+        nan_count = int(np.isnan(points).any(axis=1).sum())
+        zero_count = int((points == 0.0).all(axis=1).sum())
+        if nan_count > num_points * 0.2 or zero_count > num_points * 0.5:
+            return None
+        return points
+    
+    @staticmethod
+    def _is_plausible_spectrum(points):
+        """Check that decoded values are all finite and of a sensible magnitude."""
+        return bool(np.isfinite(points).all()) and float(np.abs(points).max()) <= RAW_MAX_VALUE
+    
+    @staticmethod
+    def _is_text_file(chunk):
+        """Check if a leading chunk of file data appears to be text."""
+        if not chunk:
             return False
+        # If most bytes are printable ASCII, consider it text
+        if len(chunk) < SMALL_SNIFF_SIZE:
+            # Too short for the numpy setup to pay off: strip the text bytes in C
+            # and count what is left
+            binary_chars = len(bytes(chunk).translate(None, _TEXT_BYTES))
+            return 1 - binary_chars / len(chunk) > 0.7
+        a = np.frombuffer(chunk, dtype=np.uint8)
+        mask = ((a >= 32) & (a <= 126)) | (a == 9) | (a == 10) | (a == 13)
+        return float(mask.mean()) > 0.7
     
     @staticmethod
-    def _parse_as_text(filepath):
-        """Fallback method to parse file as text."""
+    def _parse_as_text(filepath, raw=None):
+        """Fallback method to parse file as text. raw is the file content if already read.
+
+        Lines starting with '#' or '%' are skipped. A row whose first two
+        values are followed by a '#' or '%' comment is kept as data.
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                
+            if raw is None:
+                raw = JascoConverter._read_file(filepath)
+            if len(raw) > NUMBA_MIN_TEXT_SIZE:
+                points = JascoConverter._parse_with_numba(raw)
+                if points is not None:
+                    return points
+
+            text = raw.decode('utf-8', errors='ignore')
+            lines = io.StringIO(text, newline=None).readlines()
+
+            # Find the first numeric data line, skipping comments and any
+            # column-title lines, and detect the separator from it once
+            first_index = None
+            for index, line in enumerate(lines):
+                parts = _split_fields(line)
+                try:
+                    float(parts[0])
+                    float(parts[1])
+                except (ValueError, IndexError):
+                    continue
+                first_index, first_data = index, line.partition('#')[0].partition('%')[0].strip()
+                break
+            if first_index is None:
+                raise ValueError("No valid data points found in file")
+            if '\t' in first_data:
+                delimiter = '\t'
+            elif ',' in first_data:
+                delimiter = ','
+            else:
+                delimiter = None
+            # Let numpy parse everything from there in C
+            try:
+                return np.loadtxt(lines, comments=('#', '%'), delimiter=delimiter,
+                                  skiprows=first_index, usecols=(0, 1), ndmin=2)
+            except (ValueError, IndexError):
+                # Mixed or malformed content: fall back to the tolerant line parser.
+                # numpy before 1.23 raises IndexError for a row shorter than usecols.
+                pass
+
             points = []
             for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if line and not line.startswith('#') and not line.startswith('%'):
+                parts = _split_fields(line)
+                if len(parts) >= 2:
                     try:
-                        # Try different separators: tab, space, comma
-                        if '\t' in line:
-                            parts = line.split('\t')
-                        elif ',' in line:
-                            parts = line.split(',')
-                        else:
-                            parts = line.split()
-                        
-                        if len(parts) >= 2:
-                            x = float(parts[0])
-                            y = float(parts[1])
-                            points.append((x, y))
-                    except (ValueError, IndexError) as e:
+                        x = float(parts[0])
+                        y = float(parts[1])
+                        points.append((x, y))
+                    except ValueError:
                         # Skip invalid lines but continue processing
                         continue
             
             if not points:
                 raise ValueError("No valid data points found in file")
-            return points
+            return np.array(points)
         except Exception as e:
             raise ValueError(f"Could not parse file: {filepath} - {str(e)}")
+
+    @staticmethod
+    def _parse_with_numba(raw):
+        """Parse large numeric text content with the compiled kernel, or return None."""
+        parser = _compiled_text_parser()
+        if parser is None:
+            return None
+        try:
+            points, ok = parser(np.frombuffer(raw, dtype=np.uint8))
+        except Exception as e:
+            print(f"[DEBUG] numba text parser failed: {e}")
+            return None
+        if not ok or len(points) == 0:
+            return None
+        return points
+
+    @staticmethod
+    def _write_xy_data(buf, data_points):
+        """Format the XYDATA rows into a binary buffer.
+
+        Each block of rows is formatted with a single %-operation on a
+        repeated row template, which is several times faster than
+        np.savetxt's per-row formatting and gives identical text.
+        """
+        row_format = "%0.4f\t%0.2f" + os.linesep
+        for start in range(0, len(data_points), WRITE_BLOCK_ROWS):
+            block = data_points[start:start + WRITE_BLOCK_ROWS]
+            buf.write((row_format * len(block) % tuple(block.ravel().tolist())).encode('ascii'))
     
     @staticmethod
     def convert_to_txt(input_path, output_path):
         """Convert Jasco file to TXT format matching jws2txt output."""
         try:
             # Read the Jasco file
-            data_points = JascoConverter.read_jws_file(input_path)
-            if not data_points:
+            data_points, metadata = JascoConverter.read_jws_file(input_path)
+            if len(data_points) == 0:
                 raise ValueError("No data points found in file")
 
-            header_fields = [
-                "TITLE", "DATA TYPE", "ORIGIN", "OWNER", "DATE", "TIME", "SPECTROMETER/DATA SYSTEM", "LOCALE", "RESOLUTION", "DELTAX", "XUNITS", "YUNITS", "FIRSTX", "LASTX", "NPOINTS", "FIRSTY", "MAXY", "MINY"
-            ]
-            header = {k: "" for k in header_fields}
-            try:
-                import olefile
-                if olefile.isOleFile(input_path):
-                    with olefile.OleFileIO(input_path) as ole:
-                        # Try to extract metadata from likely streams
-                        for meta_stream in ["Header", "BaseInfo", "DataInfo", "MeasInfo", "SampleInfo", "UserInfo"]:
-                            if ole.exists(meta_stream):
-                                raw = ole.openstream(meta_stream).read()
-                                try:
-                                    text = raw.decode("utf-8")
-                                except:
-                                    try:
-                                        text = raw.decode("utf-16").replace("\x00", "")
-                                    except:
-                                        text = raw.decode(errors="ignore")
-                                for line in text.splitlines():
-                                    # Try tab-separated, colon, or space
-                                    if '\t' in line:
-                                        parts = line.split('\t', 1)
-                                    elif ':' in line:
-                                        parts = line.split(':', 1)
-                                    else:
-                                        parts = line.split(None, 1)
-                                    if len(parts) == 2:
-                                        key = parts[0].strip().upper()
-                                        value = parts[1].strip()
-                                        for field in header_fields:
-                                            if key == field or key.replace(' ', '') == field.replace(' ', ''):
-                                                header[field] = value
-                                # If all fields are filled, break
-                                if all(header[k] for k in ["TITLE", "DATE", "TIME"]):
-                                    break
-            except Exception as e:
-                print(f"[DEBUG] Metadata extraction failed: {e}")
+            header = {k: "" for k in JascoConverter.HEADER_FIELDS}
+            header.update(metadata)
 
             # Fill in header fields with calculated values if possible
-            if data_points:
-                xvals = [x for x, y in data_points]
-                yvals = [y for x, y in data_points]
-                header["FIRSTX"] = f"{xvals[0]:10.4f}" if xvals else ""
-                header["LASTX"] = f"{xvals[-1]:10.4f}" if xvals else ""
-                header["NPOINTS"] = f"{len(data_points):7d}"
-                header["FIRSTY"] = f"{yvals[0]:10.5f}" if yvals else ""
-                header["MAXY"] = f"{max(yvals):10.5f}" if yvals else ""
-                header["MINY"] = f"{min(yvals):10.5f}" if yvals else ""
+            xvals = data_points[:, 0]
+            yvals = data_points[:, 1]
+            header["FIRSTX"] = f"{xvals[0]:10.4f}"
+            header["LASTX"] = f"{xvals[-1]:10.4f}"
+            header["NPOINTS"] = f"{len(data_points):7d}"
+            header["FIRSTY"] = f"{yvals[0]:10.5f}"
+            header["MAXY"] = f"{np.nanmax(yvals):10.5f}"
+            header["MINY"] = f"{np.nanmin(yvals):10.5f}"
             # Set some defaults if not present
             if not header["ORIGIN"]: header["ORIGIN"] = "JASCO"
             if not header["DATA TYPE"]: header["DATA TYPE"] = "FLUORESCENCE SPECTRUM"
@@ -213,13 +598,14 @@ class JascoConverter:
             if not header["XUNITS"]: header["XUNITS"] = "SEC"
             if not header["YUNITS"]: header["YUNITS"] = "INTENSITY"
 
-            # Write to TXT file in the expected format
-            with open(output_path, 'w') as f:
-                for k in header_fields:
-                    f.write(f"{k}\t{header[k]}\n")
-                f.write("XYDATA\n")
-                for x, y in data_points:
-                    f.write(f"{x:0.4f}\t{y:0.2f}\n")
+            # Write to TXT file in the expected format. The output is built in
+            # memory and written with one call; line endings and encoding match
+            # what a text-mode open() would produce.
+            buf = io.BytesIO()
+            header_text = "".join(f"{k}\t{header[k]}\n" for k in JascoConverter.HEADER_FIELDS) + "XYDATA\n"
+            buf.write(header_text.replace("\n", os.linesep).encode(locale.getpreferredencoding(False)))
+            JascoConverter._write_xy_data(buf, data_points)
+            Path(output_path).write_bytes(buf.getbuffer())
             return True, f"Successfully converted {len(data_points)} data points"
         except Exception as e:
             return False, f"Error converting file: {str(e)}"
@@ -236,8 +622,14 @@ class JascoConverterGUI:
         
         # Variables
         self.selected_files = []
+        self._selected_set = set()  # Fast membership checks for selected_files
         self.output_directory = tk.StringVar()
         
+        # Log messages are buffered and flushed to the widget together
+        self._log_buf = []
+        self._log_pending = False
+        self._log_lock = threading.Lock()
+        
         # Create GUI elements
         self.create_widgets()
         
@@ -362,10 +754,15 @@ class JascoConverterGUI:
             title="Select Jasco Files",
             filetypes=filetypes
         )
+        new_files = []
         for file in files:
-            if file not in self.selected_files:
-                self.selected_files.append(file)
-                self.file_listbox.insert(tk.END, os.path.basename(file))
+            if file not in self._selected_set:
+                self._selected_set.add(file)
+                new_files.append(file)
+        if new_files:
+            self.selected_files.extend(new_files)
+            # One insert call so the listbox and scrollbar update once
+            self.file_listbox.insert(tk.END, *[os.path.basename(f) for f in new_files])
         if files:
             # Set output directory to the directory of the first selected file
             first_file_dir = os.path.dirname(files[0])
@@ -382,6 +779,7 @@ class JascoConverterGUI:
         
         # Remove in reverse order to maintain indices
         for index in reversed(selection):
+            self._selected_set.discard(self.selected_files[index])
             del self.selected_files[index]
             self.file_listbox.delete(index)
         
@@ -390,6 +788,7 @@ class JascoConverterGUI:
     def clear_all(self):
         """Clear all selected files."""
         self.selected_files.clear()
+        self._selected_set.clear()
         self.file_listbox.delete(0, tk.END)
         self.log("Cleared all files")
     
@@ -405,10 +804,22 @@ class JascoConverterGUI:
             self.log(f"Output directory set to: {directory}")
     
     def log(self, message):
-        """Add message to log."""
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        """Add message to log. Messages are written to the widget in batches."""
+        with self._log_lock:
+            self._log_buf.append(f"{message}\n")
+            if self._log_pending:
+                return
+            self._log_pending = True
+        self.root.after(100, self._flush_log)
+    
+    def _flush_log(self):
+        """Write all buffered log messages with a single insert."""
+        with self._log_lock:
+            messages, self._log_buf = self._log_buf, []
+            self._log_pending = False
+        if messages:
+            self.log_text.insert(tk.END, "".join(messages))
+            self.log_text.see(tk.END)
     
     def start_conversion(self):
         """Start the conversion process in a separate thread."""
@@ -416,67 +827,94 @@ class JascoConverterGUI:
             messagebox.showwarning("No Files", "Please select files to convert.")
             return
         
-        if not os.path.isdir(self.output_directory.get()):
+        output_directory = self.output_directory.get()
+        if not os.path.isdir(output_directory):
             messagebox.showerror("Invalid Directory", "Please select a valid output directory.")
             return
         
         # Disable convert button during conversion
         self.convert_button.config(state='disabled')
         
-        # Start conversion in separate thread
-        thread = threading.Thread(target=self.convert_files)
+        # Start conversion in separate thread. It gets its own copy of the file
+        # list and output directory, so it never reads Tk variables and is not
+        # affected by files being added or removed meanwhile.
+        thread = threading.Thread(target=self.convert_files,
+                                  args=(list(self.selected_files), Path(output_directory)))
         thread.daemon = True
         thread.start()
     
-    def convert_files(self):
-        """Convert all selected files."""
-        total_files = len(self.selected_files)
+    def _ui(self, func, *args, **kwargs):
+        """Schedule a Tk call on the main thread; Tk widgets are not thread-safe."""
+        self.root.after(0, lambda: func(*args, **kwargs))
+    
+    def convert_files(self, input_files, output_directory):
+        """Convert input_files into output_directory in parallel worker processes."""
+        total_files = len(input_files)
         successful_conversions = 0
         failed_conversions = 0
         
         try:
-            self.progress_bar.config(maximum=total_files)
+            self._ui(self.progress_bar.config, maximum=total_files)
+            # Let the OS read ahead while earlier files are being parsed
+            JascoConverter.prefetch_files(input_files)
             
-            for i, input_file in enumerate(self.selected_files):
-                # Update progress
-                self.progress_var.set(f"Converting {i+1}/{total_files}: {os.path.basename(input_file)}")
-                self.progress_bar.config(value=i)
-                
-                # Generate output filename
-                input_path = Path(input_file)
-                output_filename = input_path.stem + ".txt"
-                output_path = Path(self.output_directory.get()) / output_filename
-                
-                # Convert file
-                success, message = JascoConverter.convert_to_txt(input_file, str(output_path))
+            # No more workers than files; a single file is converted on a thread
+            # so it does not pay for starting a worker process
+            workers = min(os.cpu_count() or 1, total_files)
+            if workers > 1:
+                # Always spawn workers: forking a process that runs Tk and this
+                # thread is unsafe, and spawn is already the default on Windows and macOS
+                executor = ProcessPoolExecutor(max_workers=workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers)
+            with executor:
+                futures = {}
+                for input_file in input_files:
+                    # Generate output filename
+                    name = os.path.basename(input_file)
+                    output_filename = os.path.splitext(name)[0] + ".txt"
+                    output_path = output_directory / output_filename
+                    
+                    # Convert file
+                    future = executor.submit(JascoConverter.convert_to_txt, input_file, str(output_path))
+                    futures[future] = (name, output_filename)
                 
-                if success:
-                    successful_conversions += 1
-                    self.log(f"✓ {os.path.basename(input_file)} -> {output_filename}")
-                else:
-                    failed_conversions += 1
-                    self.log(f"✗ {os.path.basename(input_file)}: {message}")
+                for i, future in enumerate(as_completed(futures), 1):
+                    name, output_filename = futures[future]
+                    success, message = future.result()
+                    
+                    # Update progress
+                    self._ui(self.progress_var.set, f"Converted {i}/{total_files}: {name}")
+                    self._ui(self.progress_bar.config, value=i)
+                    
+                    if success:
+                        successful_conversions += 1
+                        self.log(f"✓ {name} -> {output_filename}")
+                    else:
+                        failed_conversions += 1
+                        self.log(f"✗ {name}: {message}")
             
             # Update final progress
-            self.progress_bar.config(value=total_files)
-            self.progress_var.set(f"Completed: {successful_conversions} successful, {failed_conversions} failed")
+            self._ui(self.progress_bar.config, value=total_files)
+            self._ui(self.progress_var.set, f"Completed: {successful_conversions} successful, {failed_conversions} failed")
             
             # Show completion message
             if failed_conversions == 0:
-                messagebox.showinfo("Conversion Complete", 
-                                  f"Successfully converted all {successful_conversions} files!")
+                self._ui(messagebox.showinfo, "Conversion Complete",
+                         f"Successfully converted all {successful_conversions} files!")
             else:
-                messagebox.showwarning("Conversion Complete with Errors",
-                                     f"Converted {successful_conversions} files successfully.\n"
-                                     f"{failed_conversions} files failed to convert.")
+                self._ui(messagebox.showwarning, "Conversion Complete with Errors",
+                         f"Converted {successful_conversions} files successfully.\n"
+                         f"{failed_conversions} files failed to convert.")
         
         except Exception as e:
             self.log(f"Error during conversion: {str(e)}")
-            messagebox.showerror("Conversion Error", f"An error occurred: {str(e)}")
+            self._ui(messagebox.showerror, "Conversion Error", f"An error occurred: {str(e)}")
         
         finally:
             # Re-enable convert button
-            self.convert_button.config(state='normal')
+            self._ui(self.convert_button.config, state='normal')
 
 
 def main():
@@ -496,4 +934,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the worker processes in PyInstaller builds
+    multiprocessing.freeze_support()
     main()
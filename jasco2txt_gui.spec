@@ -28,7 +28,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # numba is optional and only speeds up large text files; keep it out of the bundle
+    excludes=['numba'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -7,7 +7,9 @@ Creates a sample test file and tests the conversion.
 import os
 import tempfile
 import struct
-from jasco2txt_gui import JascoConverter
+import numpy as np
+import jasco2txt_gui
+from jasco2txt_gui import JascoConverter, _compiled_text_parser, _parse_numeric_text
 
 def create_test_jws_file(filepath, num_points=100):
     """Create a simple test JWS file with dummy data."""
@@ -94,17 +96,365 @@ def test_text_file_parsing():
     
     return True
 
+def test_inline_comment_rows():
+    """Test that rows with a trailing comment after the values are kept."""
+    print("\nTesting text rows with trailing comments...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_txt = os.path.join(temp_dir, "commented.txt")
+        output_txt = os.path.join(temp_dir, "commented_output.txt")
+        
+        with open(test_txt, 'w') as f:
+            f.write("# Wavenumber\tIntensity\n")
+            f.write("1000\t0.5 # baseline\n")
+            f.write("1050\t0.75\n")
+            f.write("1100\t0.25 % peak\n")
+        
+        success, message = JascoConverter.convert_to_txt(test_txt, output_txt)
+        
+        if success and "3 data points" in message:
+            print("✓ Commented rows kept!")
+            print(f"Message: {message}")
+        else:
+            print("✗ Commented rows were not parsed as expected!")
+            print(f"Error: {message}")
+            return False
+    
+    return True
+
+def test_decimal_comma_rejected():
+    """Test that decimal commas in a tab-delimited file are not split into two values."""
+    print("\nTesting tab-delimited file with decimal commas...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_txt = os.path.join(temp_dir, "decimal_comma.txt")
+        output_txt = os.path.join(temp_dir, "decimal_comma_output.txt")
+        
+        with open(test_txt, 'w') as f:
+            f.write("Wavelength\tAbs\n")
+            for i in range(20):
+                f.write(f"{200 + i},5\t0,{25 + i}\n")
+        
+        success, message = JascoConverter.convert_to_txt(test_txt, output_txt)
+        
+        if success:
+            print("✗ Decimal-comma data was split into wrong values!")
+            print(f"Message: {message}")
+            return False
+        print("✓ Decimal-comma data rejected")
+        print(f"Message: {message}")
+    
+    return True
+
+def test_odd_length_binary():
+    """Test that a binary payload with a stray trailing byte still converts."""
+    print("\nTesting binary file with trailing partial data point...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_jws = os.path.join(temp_dir, "odd_file.jws")
+        output_txt = os.path.join(temp_dir, "odd_output.txt")
+        
+        create_test_jws_file(test_jws, 30)
+        with open(test_jws, 'ab') as f:
+            f.write(b'\x01')
+        
+        success, message = JascoConverter.convert_to_txt(test_jws, output_txt)
+        
+        if success and "30 data points" in message:
+            print("✓ Odd-length binary conversion successful!")
+            print(f"Message: {message}")
+        else:
+            print("✗ Odd-length binary conversion failed!")
+            print(f"Error: {message}")
+            return False
+    
+    return True
+
+def test_random_binary_rejected():
+    """Test that random bytes under a Jasco extension are not reported as a spectrum."""
+    print("\nTesting random binary data...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_jws = os.path.join(temp_dir, "noise.jws")
+        output_txt = os.path.join(temp_dir, "noise_output.txt")
+        
+        with open(test_jws, 'wb') as f:
+            f.write(os.urandom(40 * 1024))
+        
+        success, message = JascoConverter.convert_to_txt(test_jws, output_txt)
+        
+        if success:
+            print("✗ Random data was converted!")
+            print(f"Message: {message}")
+            return False
+        print("✓ Random data rejected")
+        print(f"Message: {message}")
+    
+    return True
+
+def create_test_ole_file(filepath, streams):
+    """Create a minimal OLE (compound file) holding the given (name, bytes) streams.
+
+    Streams are padded to 4096 bytes so that they live in regular sectors;
+    the whole file must fit in 127 sectors.
+    """
+    sector = 512
+    end_of_chain, free_sector, fat_sector, no_stream = 0xFFFFFFFE, 0xFFFFFFFF, 0xFFFFFFFD, 0xFFFFFFFF
+    streams = [(name, data.ljust(4096, b'\x00')) for name, data in streams]
+    dir_sectors = (len(streams) + 1 + 3) // 4
+    fat = [free_sector] * (sector // 4)
+    fat[0] = fat_sector
+    for i in range(1, dir_sectors + 1):
+        fat[i] = i + 1 if i < dir_sectors else end_of_chain
+    next_sector = dir_sectors + 1
+    
+    def dir_entry(name, kind, right, child, start, size):
+        encoded = (name + '\x00').encode('utf-16-le')
+        return (encoded.ljust(64, b'\x00') + struct.pack('<HBB', len(encoded), kind, 1)
+                + struct.pack('<III', no_stream, right, child) + b'\x00' * 36
+                + struct.pack('<III', start, size, 0))
+    
+    entries = [dir_entry('Root Entry', 5, no_stream, 1 if streams else no_stream, end_of_chain, 0)]
+    body = b''
+    for index, (name, data) in enumerate(streams):
+        count = (len(data) + sector - 1) // sector
+        for i in range(next_sector, next_sector + count):
+            fat[i] = i + 1 if i < next_sector + count - 1 else end_of_chain
+        right = index + 2 if index + 1 < len(streams) else no_stream
+        entries.append(dir_entry(name, 2, right, no_stream, next_sector, len(data)))
+        body += data.ljust(count * sector, b'\x00')
+        next_sector += count
+    entries += [b'\x00' * 128] * (-len(entries) % 4)
+    header = (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 16
+              + struct.pack('<HHHHH', 0x3E, 3, 0xFFFE, 9, 6) + b'\x00' * 6
+              + struct.pack('<IIIIIIIII', 0, 1, 1, 0, 0, end_of_chain, 0, end_of_chain, 0)
+              + struct.pack('<I', 0) + struct.pack('<I', free_sector) * 108)
+    with open(filepath, 'wb') as f:
+        f.write(header + struct.pack('<128I', *fat) + b''.join(entries) + body)
+
+def float_stream(values):
+    """Pack values as a little-endian float32 stream."""
+    return struct.pack(f'<{len(values)}f', *values)
+
+def convert_and_read(input_path, output_path):
+    """Convert a file and return (success, message, output lines)."""
+    success, message = JascoConverter.convert_to_txt(input_path, output_path)
+    lines = []
+    if success:
+        with open(output_path, 'r') as f:
+            lines = f.read().splitlines()
+    return success, message, lines
+
+def test_ole_xy_streams():
+    """Test an OLE file with X-Data and Y-Data streams and header metadata."""
+    print("\nTesting OLE file with X-Data and Y-Data...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_jws = os.path.join(temp_dir, "xy_file.jws")
+        output_txt = os.path.join(temp_dir, "xy_output.txt")
+        
+        xs = [200.0 + i * 0.5 for i in range(1024)]
+        ys = [(i % 50) * 0.25 for i in range(1024)]
+        header = b"TITLE\tSample A\nDATE\t24/01/01\nTIME: 12:30:00\nX UNITS\tNANOMETERS\n"
+        create_test_ole_file(test_jws, [('Header', header), ('X-Data', float_stream(xs)), ('Y-Data', float_stream(ys))])
+        
+        success, message, lines = convert_and_read(test_jws, output_txt)
+        
+        expected = ["TITLE\tSample A", "DATE\t24/01/01", "TIME\t12:30:00", "XUNITS\tNANOMETERS",
+                    "NPOINTS\t   1024", "200.0000\t0.00", "200.5000\t0.25"]
+        missing = [line for line in expected if line not in lines]
+        if success and not missing:
+            print("✓ X/Y stream conversion successful!")
+            print(f"Message: {message}")
+        else:
+            print("✗ X/Y stream conversion failed!")
+            print(f"Error: {message}, missing lines: {missing}")
+            return False
+    
+    return True
+
+def test_ole_y_only_deltax():
+    """Test an OLE file with only Y-Data, taking the X spacing from DELTAX."""
+    print("\nTesting OLE file with Y-Data and DELTAX...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_jws = os.path.join(temp_dir, "yonly_file.jws")
+        output_txt = os.path.join(temp_dir, "yonly_output.txt")
+        
+        ys = [(i % 50) * 0.25 for i in range(1024)]
+        create_test_ole_file(test_jws, [('Header', b"TITLE\tY only\nDELTAX\t0.5\n"), ('Y-Data', float_stream(ys))])
+        
+        success, message, lines = convert_and_read(test_jws, output_txt)
+        
+        data = lines[lines.index("XYDATA") + 1:] if "XYDATA" in lines else []
+        if success and len(data) == 1024 and data[:3] == ["0.0000\t0.00", "0.5000\t0.25", "1.0000\t0.50"] \
+                and data[-1] == "511.5000\t5.75" and "DELTAX\t0.5" in lines:
+            print("✓ Y-only conversion successful!")
+            print(f"Message: {message}")
+        else:
+            print("✗ Y-only conversion failed!")
+            print(f"Error: {message}, first rows: {data[:3]}")
+            return False
+    
+    return True
+
+def test_ole_metadata_streams():
+    """Test that header fields are collected from several OLE metadata streams."""
+    print("\nTesting OLE metadata from several streams...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_jws = os.path.join(temp_dir, "meta_file.jws")
+        output_txt = os.path.join(temp_dir, "meta_output.txt")
+        
+        pairs = [(200.0 + i, (i % 10) * 0.5) for i in range(1024)]
+        create_test_ole_file(test_jws, [
+            ('Header', "TITLE\tWide title\nOWNER\tlab\n".encode('utf-16')),
+            ('BaseInfo', b"DATE\t24/02/02\nTIME\t08:00:00\nSPECTROMETER/DATA SYSTEM\tJASCO Corp., FP-8500\n"),
+            ('Data', float_stream([v for pair in pairs for v in pair])),
+        ])
+        
+        success, message, lines = convert_and_read(test_jws, output_txt)
+        
+        expected = ["TITLE\tWide title", "OWNER\tlab", "DATE\t24/02/02", "TIME\t08:00:00",
+                    "SPECTROMETER/DATA SYSTEM\tJASCO Corp., FP-8500", "NPOINTS\t   1024", "201.0000\t0.50"]
+        missing = [line for line in expected if line not in lines]
+        if success and not missing:
+            print("✓ Metadata merging successful!")
+            print(f"Message: {message}")
+        else:
+            print("✗ Metadata merging failed!")
+            print(f"Error: {message}, missing lines: {missing}")
+            return False
+    
+    return True
+
+def test_ole_metadata_early_exit():
+    """Test that metadata scanning stops once every header field is filled."""
+    print("\nTesting OLE metadata with a key repeated after all fields are filled...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_jws = os.path.join(temp_dir, "repeat_file.jws")
+        output_txt = os.path.join(temp_dir, "repeat_output.txt")
+        
+        fields = [f for f in JascoConverter.HEADER_FIELDS if f not in JascoConverter.COMPUTED_FIELDS]
+        values = {f: f"value {i}" for i, f in enumerate(fields)}
+        values["TITLE"] = "My sample"
+        header = "TITLE\tEarly\n" + "".join(f"{f}\t{v}\n" for f, v in values.items()) + "TITLE\tOverride\n"
+        create_test_ole_file(test_jws, [('Header', header.encode()), ('X-Data', float_stream([1.0] * 1024)),
+                                        ('Y-Data', float_stream([2.0] * 1024))])
+        
+        success, message, lines = convert_and_read(test_jws, output_txt)
+        
+        # The repeat before the last field is filled overrides "Early"; the one after is not read
+        if success and "TITLE\tMy sample" in lines and "OWNER\tvalue 3" in lines:
+            print("✓ Metadata scan stopped once complete")
+            print(f"Message: {message}")
+        else:
+            print("✗ Unexpected metadata after early exit!")
+            print(f"Error: {message}, header: {lines[:6]}")
+            return False
+    
+    return True
+
+def build_numeric_text(separators, min_size=100 * 1024):
+    """Build text data mixing line endings, exponents and comment lines.
+    Returns (content, expected values)."""
+    line_endings = ["\n", "\r\n", "\r"]
+    parts = ["# Exported spectrum\r\n", "% second header line\n"]
+    expected = []
+    size = 0
+    i = 0
+    while size < min_size:
+        x = f"{200.0 + i * 0.125:.3f}"
+        y = f"{((i * 37) % 1009) * 1.7e-3:.6e}" if i % 3 else f"-{(i % 997) / 7:.5f}"
+        row = x + separators[i % len(separators)] + y + line_endings[i % 3]
+        if i % 500 == 250:
+            row = "# marker inside the data" + line_endings[i % 3] + row
+        parts.append(row)
+        expected.append((float(x), float(y)))
+        size += len(row)
+        i += 1
+    return "".join(parts), np.array(expected)
+
+def test_numeric_text_kernel():
+    """Test the fast text parser against float() and its fallback to np.loadtxt."""
+    print("\nTesting numeric text parser...")
+    
+    # The compiled parser when numba is installed, else the same code in Python
+    parse_numeric_text = _compiled_text_parser() or _parse_numeric_text
+    for separator in [", ", ",", "   ", "\t"]:
+        content, expected = build_numeric_text([separator])
+        points, ok = parse_numeric_text(np.frombuffer(content.encode("ascii"), dtype=np.uint8))
+        if not ok or not np.array_equal(points, expected):
+            print(f"✗ Numeric text parser does not match float() with separator {separator!r}!")
+            return False
+        print(f"✓ Parsed {len(points)} rows separated by {separator!r} matching float()")
+    
+    # Zeros with exponents beyond the power-of-ten table
+    zeros = ["0e30", "-0e320", "0.0e-40", "0." + "0" * 25, "-0.000e+99"]
+    text = content + "".join(f"{i}\t{zero}\n" for i, zero in enumerate(zeros))
+    points, ok = parse_numeric_text(np.frombuffer(text.encode("ascii"), dtype=np.uint8))
+    tail = points[-len(zeros):, 1]
+    if not ok or not np.array_equal(tail, [float(z) for z in zeros]) \
+            or not np.array_equal(np.signbit(tail), [np.signbit(float(z)) for z in zeros]):
+        print("✗ Zeros with large exponents were not parsed as zero!")
+        return False
+    print("✓ Zeros with large exponents parsed as signed zeros")
+    
+    # Content the fast parser must reject, and what the numpy parser makes of it
+    content, expected = build_numeric_text(["\t"])
+    fallbacks = {
+        "column titles": ("Wavelength\tIntensity\n" + content, expected),
+        "one column": (content + "\n123.5\n", expected),
+        "nan": (content + "\nnan\t1.0\n", np.vstack((expected, [[np.nan, 1.0]]))),
+        "17 digits": (content + "\n930.94499999999994\t1.0\n",
+                      np.vstack((expected, [[930.94499999999994, 1.0]]))),
+        "decimal commas": (content + "\n200,5\t0,025\n", expected),
+        "a comma row": (content + "\n7,8\n", np.vstack((expected, [[7.0, 8.0]]))),
+    }
+    # Send these small files through the fast parser as if they were large
+    min_size = jasco2txt_gui.NUMBA_MIN_TEXT_SIZE
+    jasco2txt_gui.NUMBA_MIN_TEXT_SIZE = 0
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_txt = os.path.join(temp_dir, "fallback.txt")
+            for name, (text, reference) in fallbacks.items():
+                raw = text.encode("ascii")
+                _, ok = parse_numeric_text(np.frombuffer(raw, dtype=np.uint8))
+                with open(test_txt, "wb") as f:
+                    f.write(raw)
+                points = JascoConverter._parse_as_text(test_txt, raw)
+                if ok or not np.array_equal(points, reference, equal_nan=True):
+                    print(f"✗ Fallback for {name} failed!")
+                    return False
+                print(f"✓ Fallback for {name} parsed {len(points)} rows")
+    finally:
+        jasco2txt_gui.NUMBA_MIN_TEXT_SIZE = min_size
+    
+    return True
+
 if __name__ == "__main__":
     print("Jasco2TXT Converter Test Suite")
     print("=" * 40)
     
     try:
         # Run tests
-        test1_passed = test_conversion()
-        test2_passed = test_text_file_parsing()
+        results = [
+            test_conversion(),
+            test_text_file_parsing(),
+            test_odd_length_binary(),
+            test_numeric_text_kernel(),
+            test_random_binary_rejected(),
+            test_ole_xy_streams(),
+            test_ole_y_only_deltax(),
+            test_ole_metadata_streams(),
+            test_ole_metadata_early_exit(),
+            test_inline_comment_rows(),
+            test_decimal_comma_rejected(),
+        ]
         
         print("\n" + "=" * 40)
-        if test1_passed and test2_passed:
+        if all(results):
             print("All tests passed! ✓")
         else:
             print("Some tests failed! ✗")